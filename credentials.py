@@ -0,0 +1,99 @@
+# credentials.py
+# Salted scrypt password hashes stored in users.csv. Kept free of Streamlit
+# so the bulk-provisioning CLI and its worker processes can import it cleanly.
+import argparse
+import csv
+import functools
+import hashlib
+import hmac
+import os
+import secrets
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+USERS_FILE = "users.csv"
+
+# Default cost: ~16 MB and ~60 ms per hash on one core, so 10k accounts is
+# ~10 CPU-minutes (~80 s on 8 cores). --log2-n 12 is ~4x cheaper (~20 s on
+# 8 cores). Every hash records its own n/r/p, so both verify the same way.
+SCRYPT_N, SCRYPT_R, SCRYPT_P = 2**14, 8, 1
+
+def hash_password(password, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P):
+    salt = secrets.token_bytes(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p)
+    return f"scrypt${n}${r}${p}${salt.hex()}${digest.hex()}"
+
+@functools.lru_cache(maxsize=1)
+def dummy_hash():
+    # verified against for unknown usernames so they cost the same time as real ones
+    return hash_password(secrets.token_hex(16))
+
+def normalize_username(username):
+    return username.strip()
+
+def _hash_with_cost(args):
+    password, n = args
+    return hash_password(password, n=n)
+
+def check_password(password, stored):
+    try:
+        algo, n, r, p, salt, digest = stored.split("$")
+        if algo != "scrypt":
+            return False
+        expected = bytes.fromhex(digest)
+        got = hashlib.scrypt(password.encode(), salt=bytes.fromhex(salt), n=int(n), r=int(r), p=int(p),
+                             dklen=len(expected), maxmem=256 * int(n) * int(r) + 2**20)
+    except (ValueError, AttributeError):
+        return False
+    return hmac.compare_digest(got, expected)
+
+def load_user_hashes(path=USERS_FILE):
+    """Return {username: password_hash}; empty if the file does not exist yet."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, newline="") as f:
+        return {row["username"]: row["password_hash"] for row in csv.DictReader(f)
+                if row.get("username") and row.get("password_hash")}
+
+def save_user_hashes(users, path=USERS_FILE):
+    # write-then-rename so a running app never reads a half-written file
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["username", "password_hash"])
+        w.writerows(users.items())
+    os.replace(tmp, path)
+
+def provision_users(accounts, path=USERS_FILE, workers=None, n=SCRYPT_N):
+    """Create or update accounts from a {username: password} dict.
+    Hashing runs in a process pool; lower n trades hash strength for speed."""
+    names = list(accounts)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        hashes = list(pool.map(_hash_with_cost, [(accounts[u], n) for u in names], chunksize=64))
+    users = load_user_hashes(path)
+    users.update(zip(names, hashes))
+    save_user_hashes(users, path)
+    return len(names)
+
+def read_accounts_csv(path):
+    with open(path, newline="") as f:
+        return {normalize_username(row["username"]): row["password"] for row in csv.DictReader(f)
+                if normalize_username(row.get("username") or "") and row.get("password")}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-create EcoChallenge accounts from a username,password CSV.")
+    parser.add_argument("accounts_csv", help="CSV with 'username' and 'password' columns")
+    parser.add_argument("--users-file", default=USERS_FILE)
+    parser.add_argument("--workers", type=int, default=None, help="hashing processes (default: all cores)")
+    parser.add_argument("--log2-n", type=int, default=SCRYPT_N.bit_length() - 1, choices=range(10, 21), metavar="{10..20}",
+                        help="scrypt cost as log2(n); default 14, 12 is ~4x faster")
+    args = parser.parse_args(argv)
+    accounts = read_accounts_csv(args.accounts_csv)
+    start = time.perf_counter()
+    count = provision_users(accounts, args.users_file, args.workers, n=2**args.log2_n)
+    print(f"Provisioned {count} accounts into {args.users_file} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
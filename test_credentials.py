@@ -0,0 +1,30 @@
+import credentials
+
+LOW_N = 2**10
+
+def test_hash_and_check_round_trip():
+    stored = credentials.hash_password("pass123", n=LOW_N)
+    assert stored.startswith(f"scrypt${LOW_N}$8$1$")
+    assert credentials.check_password("pass123", stored)
+
+def test_check_password_rejects_bad_input():
+    stored = credentials.hash_password("pass123", n=LOW_N)
+    assert not credentials.check_password("wrong", stored)
+    assert not credentials.check_password("pass123", "not-a-hash")
+    assert not credentials.check_password("pass123", "scrypt$x$8$1$zz$zz")
+    assert not credentials.check_password("pass123", stored.replace("scrypt$", "bcrypt$", 1))
+
+def test_provision_users_merges_with_existing_file(tmp_path):
+    path = str(tmp_path / "users.csv")
+    credentials.save_user_hashes({"old": credentials.hash_password("oldpw", n=LOW_N)}, path)
+    count = credentials.provision_users({"new": "newpw"}, path, workers=1, n=LOW_N)
+    users = credentials.load_user_hashes(path)
+    assert count == 1
+    assert set(users) == {"old", "new"}
+    assert credentials.check_password("oldpw", users["old"])
+    assert credentials.check_password("newpw", users["new"])
+
+def test_read_accounts_csv_skips_blank_rows(tmp_path):
+    path = tmp_path / "accounts.csv"
+    path.write_text("username,password\n student1 ,pw1\n,\n   ,pw\nstudent2,\nstudent3,pw3\n")
+    assert credentials.read_accounts_csv(str(path)) == {"student1": "pw1", "student3": "pw3"}
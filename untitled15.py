@@ -4,20 +4,35 @@ import pandas as pd
 import numpy as np
 import random
 import os
+import hashlib
+import hmac
+import secrets
+import threading
+import time
 from datetime import datetime, date
 import streamlit.components.v1 as components
+import credentials
 
 # ----------------------------
 # Config & files
 # ----------------------------
 st.set_page_config(page_title="EcoChallenge Ultimate 🌱", page_icon="🌍", layout="wide")
 
-USERS = {"student1":"pass123","student2":"eco456","guest":"guest123"}
+USERS_FILE = credentials.USERS_FILE
 LEADERBOARD_FILE = "leaderboard.csv"
 PROGRESS_FILE = "progress.csv"
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# failed-login rate limits; the IP bucket is large because a classroom may share one NAT address
+LOGIN_USER_BUCKET_SIZE = 5         # failed attempts per (username, IP) in a burst
+LOGIN_USER_REFILL_PER_SEC = 1/30   # one extra attempt every 30 s
+LOGIN_ACCOUNT_BUCKET_SIZE = 30     # failed attempts per username across all IPs
+LOGIN_ACCOUNT_REFILL_PER_SEC = 1/120
+LOGIN_IP_BUCKET_SIZE = 200
+LOGIN_IP_REFILL_PER_SEC = 1
+LOGIN_MAX_BUCKETS = 10000          # evict refilled/oldest buckets beyond this
+
 # ensure CSVs exist
 if not os.path.exists(LEADERBOARD_FILE):
     pd.DataFrame(columns=["username","points"]).to_csv(LEADERBOARD_FILE,index=False)
@@ -83,6 +98,94 @@ def update_leaderboard(username):
         df = pd.concat([df, pd.DataFrame({"username":[username],"points":[int(st.session_state["points"])]})], ignore_index=True)
     df.to_csv(LEADERBOARD_FILE, index=False)
 
+# ----------------------------
+# Credential store (salted scrypt hashes in USERS_FILE, see credentials.py)
+# ----------------------------
+# optional first-run seed from the environment, e.g. ECO_SEED_USERS="student1:pw1,guest:pw2"
+if not os.path.exists(USERS_FILE) and os.environ.get("ECO_SEED_USERS"):
+    seed = dict(pair.split(":", 1) for pair in os.environ["ECO_SEED_USERS"].split(",") if ":" in pair)
+    credentials.save_user_hashes({credentials.normalize_username(u): credentials.hash_password(p) for u, p in seed.items()})
+
+@st.cache_resource(max_entries=1)
+def user_directory(mtime_ns):
+    # keyed on the file's mtime so a provisioning run is picked up on the next login; read-only, never mutate
+    return credentials.load_user_hashes(USERS_FILE)
+
+def get_password_hash(username):
+    try:
+        mtime_ns = os.stat(USERS_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return user_directory(mtime_ns).get(username)
+
+@st.cache_resource
+def verified_cache():
+    # username -> (stored hash, keyed fast digest of the password that verified against it)
+    return {"key": secrets.token_bytes(32), "entries": {}, "lock": threading.Lock()}
+
+def verify_login(username, password):
+    stored = get_password_hash(username)
+    if stored is None:
+        credentials.check_password(password, credentials.dummy_hash())
+        return False
+    cache = verified_cache()
+    fast = hmac.new(cache["key"], password.encode(), hashlib.sha256).digest()
+    with cache["lock"]:
+        hit = cache["entries"].get(username)
+    if hit and hit[0] == stored and hmac.compare_digest(hit[1], fast):
+        return True
+    if not credentials.check_password(password, stored):
+        return False
+    with cache["lock"]:
+        cache["entries"][username] = (stored, fast)
+    return True
+
+@st.cache_resource
+def login_buckets():
+    # key -> (tokens, last refill time, size, refill rate); shared across sessions
+    return {"buckets": {}, "lock": threading.Lock()}
+
+def _refilled(bucket, now):
+    tokens, last, size, rate = bucket
+    return min(size, tokens + (now - last) * rate)
+
+def reserve_login_tokens(specs):
+    """Take one token from every (key, size, rate) bucket, or from none if any is empty.
+    Reserving before the slow verify stops parallel attempts from overrunning the limit."""
+    state = login_buckets()
+    now = time.monotonic()
+    with state["lock"]:
+        buckets = state["buckets"]
+        levels = [_refilled(buckets[k], now) if k in buckets else size for k, size, rate in specs]
+        if any(tokens < 1 for tokens in levels):
+            return False
+        for (key, size, rate), tokens in zip(specs, levels):
+            buckets.pop(key, None)
+            buckets[key] = (tokens - 1, now, size, rate)
+        if len(buckets) > LOGIN_MAX_BUCKETS:
+            # drop buckets that are full again; if still too many, drop the least recently charged
+            for k in [k for k, b in buckets.items() if _refilled(b, now) >= b[2]]:
+                del buckets[k]
+            while len(buckets) > LOGIN_MAX_BUCKETS:
+                del buckets[next(iter(buckets))]
+    return True
+
+def refund_login_tokens(specs):
+    # successful logins give their reserved tokens back, so only failures count
+    state = login_buckets()
+    now = time.monotonic()
+    with state["lock"]:
+        buckets = state["buckets"]
+        for key, size, rate in specs:
+            if key in buckets:
+                buckets[key] = (min(size, _refilled(buckets[key], now) + 1), now, size, rate)
+
+def client_ip():
+    try:
+        return st.context.ip_address
+    except AttributeError:
+        return None
+
 def get_title(points):
     titles = ["Hero 🌱", "Star ⭐", "Superstar 🌟", "Legend 🌍"]
     level = points // 100
@@ -587,16 +690,30 @@ def reset_progress():
 # ----------------------------
 def login_page():
     st.title("🔐 EcoChallenge Login")
-    usr = st.text_input("Username")
+    usr = credentials.normalize_username(st.text_input("Username"))
     pwd = st.text_input("Password", type="password")
+    if not os.path.exists(USERS_FILE):
+        st.info("No accounts yet. Create them with: python credentials.py accounts.csv")
     if st.button("Login"):
-        if usr in USERS and USERS[usr] == pwd:
+        # tokens are reserved up front and refunded on success, so only failures count.
+        # The small (username, IP) bucket stops one address hammering an account; the larger
+        # per-username bucket caps guessing across rotating IPs. The IP bucket is skipped when
+        # the IP is unknown (localhost, older Streamlit).
+        ip = client_ip()
+        specs = [(("user", usr, ip), LOGIN_USER_BUCKET_SIZE, LOGIN_USER_REFILL_PER_SEC),
+                 (("account", usr), LOGIN_ACCOUNT_BUCKET_SIZE, LOGIN_ACCOUNT_REFILL_PER_SEC)]
+        if ip:
+            specs.append((("ip", ip), LOGIN_IP_BUCKET_SIZE, LOGIN_IP_REFILL_PER_SEC))
+        if not reserve_login_tokens(specs):
+            st.error("Too many login attempts. Please wait a minute and try again.")
+        elif verify_login(usr, pwd):
+            refund_login_tokens(specs)
             st.session_state["login"] = True
             st.session_state["username"] = usr
             load_progress(usr)
             st.success(f"Welcome {usr} 🌿")
         else:
-            st.error("Invalid credentials. Use student1/pass123 etc.")
+            st.error("Invalid credentials.")
 
 def main_app():
     # sidebar: show user, save, reset